@@ -2,32 +2,81 @@
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import List, Literal, Tuple, Dict
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Literal, NamedTuple, Optional, Tuple, Dict
 from datetime import datetime, timedelta, date
+from bisect import bisect_left
+from functools import lru_cache
+from itertools import accumulate
 from zoneinfo import ZoneInfo
-from astral import LocationInfo
-from astral.sun import sun
-import math
+import os
 import re
+import threading
 import swisseph as swe  # Swiss Ephemeris
 
-app = FastAPI(title="Jyotisa Compute API", version="2.4.0")
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by orjson when it is installed."""
+    def render(self, content) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content)
+
+app = FastAPI(title="Jyotisa Compute API", version="2.4.0", default_response_class=FastJSONResponse)
 
 # --- CORS (allow GPT Actions) ---
+# Explicit origins/methods let Starlette answer with precomputed headers instead of
+# reflecting every Origin; preflights are cached client-side for a day.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=["https://chat.openai.com", "https://chatgpt.com"],
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=["GET", "POST", "OPTIONS"],
     allow_headers=["*"],
+    max_age=86400,
 )
 
 # -----------------------------
 # Swiss Ephemeris configuration
 # -----------------------------
 swe.set_ephe_path("")  # str (not bytes)
-swe.set_sid_mode(swe.SIDM_LAHIRI, 0, 0)  # default; can change per-request
+
+# JYOTISA_FAST=1 uses the built-in Moshier theory: no ephemeris file lookups,
+# planetary longitudes within a few arcseconds of the Swiss files.
+USE_MOSEPH = os.environ.get("JYOTISA_FAST", "0") == "1"
+EPHE_FLAG = swe.FLG_MOSEPH if USE_MOSEPH else swe.FLG_SWIEPH
+
+# Sidereal mode is Swiss state held in thread-local storage (sync endpoints run
+# in a worker pool), so track it per thread: cached results key on it and an
+# unchanged mode skips the C call.
+AYANAMSHA_MODES = {
+    "Lahiri": swe.SIDM_LAHIRI,
+    "Raman": swe.SIDM_RAMAN,
+    "Krishnamurti": swe.SIDM_KRISHNAMURTI,
+}
+_swe_thread = threading.local()
+
+def current_sid_mode() -> int:
+    # A thread that never set a mode runs on the Swiss default
+    return getattr(_swe_thread, "sid_mode", swe.SIDM_FAGAN_BRADLEY)
+
+def set_sid_mode(mode: int) -> None:
+    if mode != current_sid_mode():
+        swe.set_sid_mode(mode, 0, 0)
+        _swe_thread.sid_mode = mode
+
+def resolve_ayanamsa(ayanamsha: str) -> int:
+    return AYANAMSHA_MODES[ayanamsha]
+
+def set_ayanamsha(ayanamsha: str) -> None:
+    set_sid_mode(resolve_ayanamsa(ayanamsha))
+
+set_sid_mode(swe.SIDM_LAHIRI)  # default; can change per-request
 
 # -----------------------------
 # Constants & lookups
@@ -64,18 +113,35 @@ YOGA_NAMES = [
     "Parigha","Shiva","Siddha","Sadhya","Shubha","Shukla","Brahma","Indra","Vaidhriti"
 ]
 
-RAHU_IDX = {"Sunday":8,"Monday":2,"Tuesday":7,"Wednesday":5,"Thursday":6,"Friday":4,"Saturday":3}
-YAMA_IDX = {"Sunday":5,"Monday":3,"Tuesday":6,"Wednesday":2,"Thursday":7,"Friday":5,"Saturday":4}
-GULI_IDX = {"Sunday":7,"Monday":6,"Tuesday":5,"Wednesday":4,"Thursday":3,"Friday":2,"Saturday":1}
+# Day-eighth (1..8) per weekday, indexed by datetime.weekday(): Monday=0 .. Sunday=6
+WEEKDAY_NAMES = ("Monday","Tuesday","Wednesday","Thursday","Friday","Saturday","Sunday")
+RAHU_IDX = (2, 7, 5, 6, 4, 3, 8)
+YAMA_IDX = (3, 6, 2, 7, 5, 4, 5)
+GULI_IDX = (6, 5, 4, 3, 2, 1, 7)
+
+# Choghadiya: day parts run the cycle from the weekday's start, night parts from five
+# steps on in strides of five; eight each, built once per weekday (Monday=0 .. Sunday=6)
+CHOGHADIYA_CYCLE = ("Udveg","Char","Labh","Amrit","Kaal","Shubh","Rog")
+CHOGHADIYA_DAY_START = (3, 6, 2, 5, 1, 4, 0)
+CHOGHADIYA_DAY = tuple(tuple(CHOGHADIYA_CYCLE[(s + i) % 7] for i in range(8)) for s in CHOGHADIYA_DAY_START)
+CHOGHADIYA_NIGHT = tuple(tuple(CHOGHADIYA_CYCLE[(s + 5 * (i + 1)) % 7] for i in range(8)) for s in CHOGHADIYA_DAY_START)
+CHOGHADIYA_QUALITY = {"Amrit": "good", "Shubh": "good", "Labh": "good", "Char": "neutral",
+                      "Udveg": "bad", "Kaal": "bad", "Rog": "bad"}
 
 # Vimshottari
 DASHA_ORDER_9 = ["Ketu","Venus","Sun","Moon","Mars","Rahu","Jupiter","Saturn","Mercury"]
+DASHA_INDEX = {lord: i for i, lord in enumerate(DASHA_ORDER_9)}
 DASHA_YEARS = {
     "Ketu": 7, "Venus": 20, "Sun": 6, "Moon": 10, "Mars": 7,
     "Rahu": 18, "Jupiter": 16, "Saturn": 19, "Mercury": 17
 }
 DAYS_PER_YEAR = 365.2425
 
+CHART_BODIES = (
+    ("Sun", swe.SUN), ("Moon", swe.MOON), ("Mars", swe.MARS), ("Mercury", swe.MERCURY),
+    ("Jupiter", swe.JUPITER), ("Venus", swe.VENUS), ("Saturn", swe.SATURN),
+)  # Rahu (mean/true node) is appended per request
+
 # -----------------------------
 # In-memory remedies (examples)
 # In production, load from JSON/DB for full content
@@ -91,10 +157,23 @@ remedies_lalkitab = {
     "Weak Moon": "Keep milk at bedside overnight, pour at a Banyan tree in morning."
 }
 
+def remedy_key(query: str) -> str:
+    return " ".join(query.lower().split())
+
+# Normalized-key indexes, built once so lookups stay O(1) and ignore case/spacing
+_remedies_vedic_idx = {remedy_key(k): v for k, v in remedies_vedic.items()}
+_remedies_lalkitab_idx = {remedy_key(k): v for k, v in remedies_lalkitab.items()}
+
 # -----------------------------
 # Models
 # -----------------------------
-class BirthChartIn(BaseModel):
+DEFAULT_VARGAS = ("D1","D9","D10")  # immutable, so the model can share it as a plain default
+
+class RequestIn(BaseModel):
+    # Request bodies are values: frozen models are hashable, so handlers can cache on them
+    model_config = ConfigDict(frozen=True)
+
+class BirthChartIn(RequestIn):
     dob_iso: str                     # "YYYY-MM-DD"
     tob_iso: str                     # "HH:MM", "HH:MM:SS", or "h:MM AM/PM"
     lat: float
@@ -103,22 +182,25 @@ class BirthChartIn(BaseModel):
     ayanamsha: Literal["Lahiri","Raman","Krishnamurti"] = "Lahiri"
     node: Literal["Mean","True"] = "Mean"
     system: Literal["vedic","lal_kitab","both"] = "vedic"
-    vargas: List[str] = Field(default_factory=lambda: ["D1","D9","D10"])
+    vargas: Tuple[str, ...] = DEFAULT_VARGAS
+    verify_lagna: bool = Field(False, description=(
+        "Also compute the tropical-minus-ayanamsha Ascendant. Without it lagna.crosscheck_delta_deg "
+        "is null and lagna.method is always 'sidereal_flag'."))
 
-class DashaIn(BaseModel):
+class DashaIn(RequestIn):
     start_iso: str                   # Birth datetime; tz-aware preferred
     method: Literal["Vimshottari","Yogini","CharA"] = "Vimshottari"
     levels: int = 3                  # 1=Mahadasha, 2=+Antar, 3=+Pratyantar
     tz: str = IST                    # Output timezone for dates
     system: Literal["vedic","lal_kitab","both"] = "vedic"
 
-class TransitsIn(BaseModel):
+class TransitsIn(RequestIn):
     from_iso: str
     months: int = 12
     orb_deg: float = 1.0
     system: Literal["vedic","lal_kitab","both"] = "vedic"
 
-class MuhurtaIn(BaseModel):
+class MuhurtaIn(RequestIn):
     date_iso: str
     lat: float
     lon: float
@@ -126,7 +208,7 @@ class MuhurtaIn(BaseModel):
     activity: str
     system: Literal["vedic","lal_kitab","both"] = "vedic"
 
-class PanchangaIn(BaseModel):
+class PanchangaIn(RequestIn):
     date_iso: str
     lat: float = HRISHIKESH_LAT
     lon: float = HRISHIKESH_LON
@@ -134,11 +216,11 @@ class PanchangaIn(BaseModel):
     ayanamsha: Literal["Lahiri","Raman","Krishnamurti"] = "Lahiri"
     system: Literal["vedic","lal_kitab","both"] = "vedic"  # Panchanga itself is common; field kept for API symmetry
 
-class RemedyIn(BaseModel):
+class RemedyIn(RequestIn):
     query: str
     system: Literal["vedic","lal_kitab","both"] = "vedic"
 
-class DebugBirthIn(BaseModel):
+class DebugBirthIn(RequestIn):
     dob_iso: str
     tob_iso: str
     lat: float
@@ -150,76 +232,136 @@ class DebugBirthIn(BaseModel):
 # -----------------------------
 # Utilities
 # -----------------------------
+UTC = ZoneInfo("UTC")
+
 def norm360(x: float) -> float:
-    y = x % 360.0
-    return y if y >= 0 else y + 360.0
+    return x % 360.0  # float % with a positive divisor is already non-negative
 
 def to_jd_ut(dt: datetime) -> float:
     if dt.tzinfo is None:
         raise ValueError("datetime must be timezone-aware UTC")
-    dt_utc = dt.astimezone(ZoneInfo("UTC"))
+    dt_utc = dt if dt.tzinfo is UTC else dt.astimezone(UTC)  # callers mostly pass UTC already
     y, m, d = dt_utc.year, dt_utc.month, dt_utc.day
     hour = dt_utc.hour + dt_utc.minute/60 + dt_utc.second/3600 + dt_utc.microsecond/3.6e9
     return swe.julday(y, m, d, hour, swe.GREG_CAL)
 
 # --- Swiss wrappers ---
-def swe_calc_positions(jd_ut: float, body: int, flags: int):
-    res = swe.calc_ut(jd_ut, body, flags)
-    if isinstance(res, tuple) and len(res) == 2 and isinstance(res[0], (list, tuple)):
-        pos, _ = res
-    else:
-        pos = res
+SIDEREAL_SPEED_FLAGS = EPHE_FLAG | swe.FLG_SIDEREAL | swe.FLG_SPEED
+
+# Ephemeris results are memoized on the exact JD plus the thread's sidereal mode,
+# so chart and dasha lookups evaluate at the instant asked for.
+@lru_cache(maxsize=8192)
+def _calc_ut_cached(jd_ut: float, body: int, flags: int, sid_mode: int):
+    set_sid_mode(sid_mode)  # compute under the keyed mode, whatever this thread last used
+    pos, _ = swe.calc_ut(jd_ut, body, flags)
     return pos  # (lon, lat, dist, lon_speed, lat_speed, dist_speed)
 
-def sun_moon_sidereal_longitudes(dt_utc: datetime, ayanamsha: str = "Lahiri") -> Tuple[float,float]:
-    if ayanamsha == "Lahiri":
-        swe.set_sid_mode(swe.SIDM_LAHIRI, 0, 0)
-    elif ayanamsha == "Raman":
-        swe.set_sid_mode(swe.SIDM_RAMAN, 0, 0)
-    elif ayanamsha == "Krishnamurti":
-        swe.set_sid_mode(swe.SIDM_KRISHNAMURTI, 0, 0)
-    jd = to_jd_ut(dt_utc)
-    flag = swe.FLG_SWIEPH | swe.FLG_SIDEREAL
-    sun = swe_calc_positions(jd, swe.SUN, flag)
-    moon = swe_calc_positions(jd, swe.MOON, flag)
-    return norm360(sun[0]), norm360(moon[0])
+@lru_cache(maxsize=1024)
+def _houses_ex_cached(jd_ut: float, lat: float, lon: float, hsys: bytes, flags: int, sid_mode: int):
+    set_sid_mode(sid_mode)
+    return swe.houses_ex(jd_ut, lat, lon, hsys, flags)
+
+@lru_cache(maxsize=1024)
+def _ayanamsa_cached(jd_ut: float, sid_mode: int) -> float:
+    set_sid_mode(sid_mode)
+    return swe.get_ayanamsa_ut(jd_ut)
+
+def swe_calc_positions(jd_ut: float, body: int, flags: int):
+    return _calc_ut_cached(jd_ut, body, flags, current_sid_mode())
+
+# The panchanga solver alone samples on a 1-second grid (well inside its tolerance),
+# so its probes near a previous one reuse that result.
+def _jd_key(jd: float) -> int:
+    return int(round(jd * 86400))
+
+@lru_cache(maxsize=4096)
+def _sun_moon_cached(jd_key: int, sid_mode: int) -> Tuple[float,float,float,float]:
+    jd = jd_key / 86400.0
+    sun = _calc_ut_cached(jd, swe.SUN, SIDEREAL_SPEED_FLAGS, sid_mode)
+    moon = _calc_ut_cached(jd, swe.MOON, SIDEREAL_SPEED_FLAGS, sid_mode)
+    return sun[0], moon[0], sun[3], moon[3]  # Swiss longitudes are already in [0, 360)
+
+def sun_moon_sidereal_with_speed(jd_ut: float) -> Tuple[float,float,float,float]:
+    """(sun_lon, moon_lon, sun_speed, moon_speed) in deg and deg/day at the solver's 1 s grid point."""
+    return _sun_moon_cached(_jd_key(jd_ut), current_sid_mode())
+
+def sun_moon_sidereal_at_jd(jd_ut: float) -> Tuple[float,float]:
+    """Sidereal Sun/Moon at exactly jd_ut in the thread's current mode; callers set it once via set_sid_mode."""
+    mode = current_sid_mode()
+    return (_calc_ut_cached(jd_ut, swe.SUN, SIDEREAL_SPEED_FLAGS, mode)[0],
+            _calc_ut_cached(jd_ut, swe.MOON, SIDEREAL_SPEED_FLAGS, mode)[0])
+
+def sun_moon_sidereal_longitudes(dt_utc: datetime) -> Tuple[float,float]:
+    return sun_moon_sidereal_at_jd(to_jd_ut(dt_utc))
 
 # --- Time parsing ---
 _AMPM_RE = re.compile(r"^\s*(\d{1,2}):(\d{2})(?::(\d{2}))?\s*([AaPp][Mm])\s*$")
 
 def parse_time_24_or_ampm(tob_str: str) -> Tuple[int,int,int]:
     s = tob_str.strip()
-    m = _AMPM_RE.match(s)
-    if m:
-        hh, mm, ss, ampm = m.groups()
-        hh = int(hh); mm = int(mm); ss = int(ss) if ss else 0
-        if hh == 12: hh = 0
-        if ampm.upper() == "PM": hh += 12
+    # Plain HH:MM[:SS] is the common case: split it directly, no regex
+    if s[-1:].isdigit():
+        parts = s.split(":")
+        if len(parts) not in (2,3):
+            raise ValueError("Time must be HH:MM or HH:MM:SS or include AM/PM")
+        hh = int(parts[0]); mm = int(parts[1]); ss = int(parts[2]) if len(parts)==3 else 0
+        if not (0 <= hh < 24 and 0 <= mm < 60 and 0 <= ss < 60):
+            raise ValueError("Invalid time fields")
         return (hh, mm, ss)
-    parts = s.split(":")
-    if len(parts) not in (2,3):
+    m = _AMPM_RE.match(s)
+    if not m:
         raise ValueError("Time must be HH:MM or HH:MM:SS or include AM/PM")
-    hh = int(parts[0]); mm = int(parts[1]); ss = int(parts[2]) if len(parts)==3 else 0
-    if not (0 <= hh < 24 and 0 <= mm < 60 and 0 <= ss < 60):
-        raise ValueError("Invalid time fields")
+    hh, mm, ss, ampm = m.groups()
+    hh = int(hh); mm = int(mm); ss = int(ss) if ss else 0
+    if hh == 12: hh = 0
+    if ampm.upper() == "PM": hh += 12
     return (hh, mm, ss)
 
-def local_to_utc(dob_iso: str, tob_str: str, tz: str) -> datetime:
+@lru_cache(maxsize=64)
+def get_zone(tz: str) -> ZoneInfo:
+    return ZoneInfo(tz)
+
+def local_to_utc(dob_iso: str, tob_str: str, tz: ZoneInfo) -> datetime:
     y, m, d = map(int, dob_iso.split("-"))
     hh, mm, ss = parse_time_24_or_ampm(tob_str)
-    local_dt = datetime(y, m, d, hh, mm, ss, tzinfo=ZoneInfo(tz))
-    return local_dt.astimezone(ZoneInfo("UTC"))
-
-def jdut_from_local(dob_iso: str, tob_str: str, tz: str) -> float:
+    return datetime(y, m, d, hh, mm, ss, tzinfo=tz).astimezone(UTC)
+
+J2000_JD = 2451545.0
+J2000_UTC = datetime(2000, 1, 1, 12, tzinfo=UTC)
+
+def jd_to_utc(jd_ut: float) -> datetime:
+    return J2000_UTC + timedelta(days=jd_ut - J2000_JD)
+
+def sun_rise_set(d: date, lat: float, lon: float, tz: ZoneInfo) -> Tuple[datetime, datetime]:
+    """Sunrise/sunset (upper limb, refracted) on local date d, from the same Swiss ephemeris."""
+    # Same city + day is the common request pattern; 4 decimals is ~11 m, well under a second of sunrise
+    return _sun_rise_set_cached(d, round(lat, 4), round(lon, 4), tz)
+
+@lru_cache(maxsize=4096)
+def _sun_rise_set_cached(d: date, lat: float, lon: float, tz: ZoneInfo) -> Tuple[datetime, datetime]:
+    geopos = (lon, lat, 0.0)
+    jd0 = to_jd_ut(datetime(d.year, d.month, d.day, tzinfo=tz))
+    res, rise = swe.rise_trans(jd0, swe.SUN, swe.CALC_RISE, geopos, flags=EPHE_FLAG)
+    sunrise = jd_to_utc(rise[0]).astimezone(tz) if res == 0 else None
+    if sunrise is None or sunrise.date() != d:
+        raise ValueError("Sun does not rise/set on this date at this latitude")
+    # Search the set from the rise: at high latitude it can fall after local midnight
+    res, set_ = swe.rise_trans(rise[0], swe.SUN, swe.CALC_SET, geopos, flags=EPHE_FLAG)
+    sunset = jd_to_utc(set_[0]).astimezone(tz) if res == 0 else None
+    if sunset is None or sunset <= sunrise:
+        raise ValueError("Sun does not rise/set on this date at this latitude")
+    return sunrise, sunset
+
+def jdut_from_local(dob_iso: str, tob_str: str, tz: ZoneInfo) -> float:
     return to_jd_ut(local_to_utc(dob_iso, tob_str, tz))
 
 # --- Asc & planets ---
 def ascendant_tropical_deg(jd_ut: float, lat: float, lon: float) -> float:
-    cusps, ascmc = swe.houses_ex(jd_ut, lat, lon, b'W', 0)  # tropical
-    return norm360(ascmc[0])
+    cusps, ascmc = _houses_ex_cached(jd_ut, lat, lon, b'W', 0, current_sid_mode())  # tropical
+    return ascmc[0]
 
 def current_ayanamsa_deg(jd_ut: float) -> float:
-    return norm360(swe.get_ayanamsa_ut(jd_ut))
+    return _ayanamsa_cached(jd_ut, current_sid_mode())
 
 def ascendant_sidereal_deg_by_subtract(jd_ut: float, lat: float, lon: float) -> float:
     asc_trop = ascendant_tropical_deg(jd_ut, lat, lon)
@@ -227,115 +369,121 @@ def ascendant_sidereal_deg_by_subtract(jd_ut: float, lat: float, lon: float) ->
     return norm360(asc_trop - ayan)
 
 def ascendant_sidereal_deg(jd_ut: float, lat: float, lon: float) -> float:
-    cusps, ascmc = swe.houses_ex(jd_ut, lat, lon, b'W', swe.FLG_SIDEREAL)
-    return norm360(ascmc[0])
+    cusps, ascmc = _houses_ex_cached(jd_ut, lat, lon, b'W', swe.FLG_SIDEREAL, current_sid_mode())
+    return ascmc[0]
 
 def planet_sidereal(jd_ut: float, p_id: int) -> Tuple[float, float]:
-    flags = swe.FLG_SWIEPH | swe.FLG_SIDEREAL | swe.FLG_SPEED
-    pos = swe_calc_positions(jd_ut, p_id, flags)
-    lon, lon_speed = pos[0], pos[3]
-    return norm360(lon), lon_speed
+    pos = swe_calc_positions(jd_ut, p_id, SIDEREAL_SPEED_FLAGS)
+    return pos[0], pos[3]
+
+class Placement(NamedTuple):
+    sign: str
+    degree: float
+    lon: float
+    house: int
+    retro: bool
 
 def sign_index(lon_deg: float) -> int:
-    return int(lon_deg // 30) + 1  # 1..12
+    return int(lon_deg) // 30 + 1  # 1..12; lon_deg is non-negative, so int() floors
 
 def degree_in_sign(lon_deg: float) -> float:
     return lon_deg % 30.0
 
+def segment_index_and_end(angle: float, seg: float) -> Tuple[int, float]:
+    """1-based segment holding angle, and the angle at which that segment ends."""
+    idx = int(angle // seg) + 1
+    return idx, (idx * seg) % 360.0
+
 def whole_sign_house(planet_sign_idx: int, asc_sign_idx: int) -> int:
     return ((planet_sign_idx - asc_sign_idx) % 12) + 1
 
 def moon_nakshatra_name_pada(moon_lon_sid: float) -> Tuple[str, int]:
-    idx = int(moon_lon_sid // SEG_27) + 1
-    name = NAK_NAMES[idx - 1]
-    arc_in_nak = (moon_lon_sid % SEG_27) * 60.0
-    pada = int(arc_in_nak // 200) + 1
-    return name, pada
+    q, rem = divmod(moon_lon_sid, SEG_27)
+    pada = int(rem * 60.0 // 200) + 1  # 200 arc-minutes per pada
+    return NAK_NAMES[int(q)], pada
 
 # -----------------------------
 # Panchanga core
 # -----------------------------
-def find_event_end_time(start_utc: datetime, predicate_crosses, max_hours=48, coarse_step_min=10, refine_to_seconds=30) -> datetime:
-    t = start_utc
-    end = start_utc + timedelta(hours=max_hours)
-    step = timedelta(minutes=coarse_step_min)
-    while t <= end and not predicate_crosses(t):
-        t += step
-    lo, hi = t - step, t
-    if lo < start_utc:
-        lo = start_utc
-    while (hi - lo).total_seconds() > refine_to_seconds:
-        mid = lo + (hi - lo) / 2
-        if predicate_crosses(mid): hi = mid
-        else: lo = mid
-    return hi
-
-def tithi_index_and_end(sunrise_utc: datetime, ayanamsha: str) -> Tuple[int, datetime]:
-    s, m = sun_moon_sidereal_longitudes(sunrise_utc, ayanamsha)
+def angle_diff(a: float, b: float) -> float:
+    """Signed a - b wrapped to [-180, 180)."""
+    return (a - b + 540.0) % 360.0 - 180.0
+
+# Panchanga angles are Moon-driven: even the slowest Moon less the fastest Sun
+# advances ~10.7 deg/day, so a lower rate can only be a bad sample.
+MIN_ANGLE_RATE = 10.0
+
+def find_angle_target_jd(jd_start: float, angle_and_rate_at, target: float,
+                         tol_sec: float = 1.0, max_iter: int = 8) -> float:
+    """
+    Newton solve for the JD after jd_start at which an angle reaches target.
+    angle_and_rate_at(jd) returns (deg, deg/day) straight from the ephemeris speeds,
+    so the first step already lands within seconds and a second one polishes it.
+    """
+    jd = jd_start
+    for _ in range(max_iter):
+        angle, rate = angle_and_rate_at(jd)
+        step = -angle_diff(angle, target) / max(rate, MIN_ANGLE_RATE)
+        jd += step
+        if abs(step) * 86400.0 < tol_sec:
+            break
+    return jd
+
+def panchanga_all_ends(sunrise_utc: datetime, sid_mode: int) -> Tuple[Tuple[int, datetime], ...]:
+    """
+    (index, end) for tithi, nakshatra, yoga and karana from one shared sunrise sample.
+    Tithi and karana track the same elongation, so a karana ending with its tithi reuses that solve.
+    The solves run on JD floats; only the four results become datetimes.
+    """
+    set_sid_mode(sid_mode)
+    jd0 = to_jd_ut(sunrise_utc)
+    s, m, _, _ = sun_moon_sidereal_with_speed(jd0)
+    def elong_at(jd: float) -> Tuple[float, float]:
+        s2, m2, ss, ms = sun_moon_sidereal_with_speed(jd)
+        return m2 - s2, ms - ss
+    def moon_at(jd: float) -> Tuple[float, float]:
+        _, m2, _, ms = sun_moon_sidereal_with_speed(jd)
+        return m2, ms
+    def yoga_at(jd: float) -> Tuple[float, float]:
+        s2, m2, ss, ms = sun_moon_sidereal_with_speed(jd)
+        return s2 + m2, ss + ms
+
     delta = norm360(m - s)
-    idx = int(delta // TITHI_DEG) + 1
-    target = ((idx) * TITHI_DEG) % 360.0
-    def crosses(t: datetime) -> bool:
-        s2, m2 = sun_moon_sidereal_longitudes(t, ayanamsha)
-        d2 = norm360(m2 - s2)
-        return d2 < TITHI_DEG if target == 0 else d2 >= target
-    end_time = find_event_end_time(sunrise_utc, crosses)
-    return idx, end_time
-
-def nakshatra_index_and_end(sunrise_utc: datetime, ayanamsha: str) -> Tuple[int, datetime]:
-    _, m = sun_moon_sidereal_longitudes(sunrise_utc, ayanamsha)
-    idx = int(m // SEG_27) + 1
-    target = ((math.floor(m / SEG_27) + 1) * SEG_27) % 360.0
-    def crosses(t: datetime) -> bool:
-        _, m2 = sun_moon_sidereal_longitudes(t, ayanamsha)
-        return m2 < SEG_27 if target == 0 else m2 >= target
-    end_time = find_event_end_time(sunrise_utc, crosses)
-    return idx, end_time
-
-def yoga_index_and_end(sunrise_utc: datetime, ayanamsha: str) -> Tuple[int, datetime]:
-    s, m = sun_moon_sidereal_longitudes(sunrise_utc, ayanamsha)
+    t_idx, t_target = segment_index_and_end(delta, TITHI_DEG)
+    t_end = find_angle_target_jd(jd0, elong_at, t_target)
+
+    k_idx, k_target = segment_index_and_end(delta, KARANA_DEG)
+    k_end = t_end if k_target == t_target else find_angle_target_jd(jd0, elong_at, k_target)
+
+    n_idx, n_target = segment_index_and_end(m, SEG_27)
+    n_end = find_angle_target_jd(jd0, moon_at, n_target)
+
     y = norm360(s + m)
-    idx = int(y // SEG_27) + 1
-    target = ((math.floor(y / SEG_27) + 1) * SEG_27) % 360.0
-    def crosses(t: datetime) -> bool:
-        s2, m2 = sun_moon_sidereal_longitudes(t, ayanamsha)
-        y2 = norm360(s2 + m2)
-        return y2 < SEG_27 if target == 0 else y2 >= target
-    end_time = find_event_end_time(sunrise_utc, crosses)
-    return idx, end_time
+    y_idx, y_target = segment_index_and_end(y, SEG_27)
+    y_end = find_angle_target_jd(jd0, yoga_at, y_target)
+
+    return ((t_idx, jd_to_utc(t_end)), (n_idx, jd_to_utc(n_end)),
+            (y_idx, jd_to_utc(y_end)), (k_idx, jd_to_utc(k_end)))
 
 # --- Full Karana (60) ---
 KARANA_MOVABLE = ["Bava","Balava","Kaulava","Taitila","Garaja","Vanija","Vishti"]
 KARANA_FIXED_END = ["Shakuni","Chatushpada","Naga"]
 KARANA_FIRST = "Kimstughna"
 
+# All 60 half-tithis of the lunar month, in order
+KARANA_NAMES = (KARANA_FIRST,) + tuple(KARANA_MOVABLE * 8) + tuple(KARANA_FIXED_END)
+
 def karana_name_by_index(idx: int) -> str:
-    if idx == 1: return KARANA_FIRST
-    if 2 <= idx <= 57: return KARANA_MOVABLE[(idx - 2) % 7]
-    if 58 <= idx <= 60: return KARANA_FIXED_END[idx - 58]
-    raise ValueError("karana index 1..60 required")
+    if not 1 <= idx <= 60:
+        raise ValueError("karana index 1..60 required")
+    return KARANA_NAMES[idx - 1]
 
-def karana_index_and_end(sunrise_utc: datetime, ayanamsha: str) -> Tuple[int, datetime]:
-    s, m = sun_moon_sidereal_longitudes(sunrise_utc, ayanamsha)
-    delta = norm360(m - s)
-    idx = int(delta // KARANA_DEG) + 1
-    target = ((math.floor(delta / KARANA_DEG) + 1) * KARANA_DEG) % 360.0
-    def crosses(t: datetime) -> bool:
-        s2, m2 = sun_moon_sidereal_longitudes(t, ayanamsha)
-        d2 = norm360(m2 - s2)
-        return d2 < KARANA_DEG if target == 0 else d2 >= target
-    end_time = find_event_end_time(sunrise_utc, crosses)
-    return idx, end_time
-
-def day_segments(start: datetime, end: datetime):
-    seg = (end - start) / 8
-    return [(start + i*seg, start + (i+1)*seg) for i in range(8)]
-
-def rahu_yama_gulika(sunrise: datetime, sunset: datetime, weekday: str) -> Dict[str, Dict[str,str]]:
-    parts = day_segments(sunrise, sunset)
+def rahu_yama_gulika(sunrise: datetime, sunset: datetime, weekday: int) -> Dict[str, Dict[str,str]]:
+    # Only three of the eight day parts are reported, so build just those
+    seg = (sunset - sunrise) / 8
     def pick(idx: int):
-        i = idx - 1
-        return parts[i][0].isoformat(), parts[i][1].isoformat()
+        start = sunrise + (idx - 1) * seg
+        return start.isoformat(), (start + seg).isoformat()
     rh_s, rh_e = pick(RAHU_IDX[weekday])
     ya_s, ya_e = pick(YAMA_IDX[weekday])
     gu_s, gu_e = pick(GULI_IDX[weekday])
@@ -345,80 +493,72 @@ def rahu_yama_gulika(sunrise: datetime, sunset: datetime, weekday: str) -> Dict[
         "gulika": {"start": gu_s, "end": gu_e}
     }
 
+def choghadiya(sunrise: datetime, sunset: datetime, next_sunrise: Optional[datetime],
+               weekday: int) -> List[Dict[str, str]]:
+    """Eight day and eight night choghadiyas of the vara, sunrise to next sunrise.
+    Without a next sunrise (polar edge days) only the day half is returned."""
+    halves = [("day", sunrise, sunset, CHOGHADIYA_DAY[weekday])]
+    if next_sunrise is not None:
+        halves.append(("night", sunset, next_sunrise, CHOGHADIYA_NIGHT[weekday]))
+    out = []
+    for period, start, end, names in halves:
+        seg = (end - start) / 8
+        bounds = [(start + i * seg).isoformat() for i in range(8)] + [end.isoformat()]
+        out += [{"period": period, "name": name, "quality": CHOGHADIYA_QUALITY[name],
+                 "start": bounds[i], "end": bounds[i + 1]} for i, name in enumerate(names)]
+    return out
+
 # -----------------------------
 # Vimshottari engine (tz-aware output)
 # -----------------------------
-def moon_nakshatra_info(dt_utc: datetime, ayanamsha: str) -> Tuple[int, float]:
-    _, m = sun_moon_sidereal_longitudes(dt_utc, ayanamsha)
-    span = SEG_27
-    idx = int(m // span) + 1
-    frac = (m % span) / span
-    return idx, frac
+def moon_nakshatra_info(dt_utc: datetime) -> Tuple[int, float]:
+    _, m = sun_moon_sidereal_longitudes(dt_utc)
+    q, rem = divmod(m, SEG_27)
+    return int(q) + 1, rem / SEG_27
 
 def lord_of_nakshatra(nak_idx: int) -> str:
     return DASHA_ORDER_9[(nak_idx - 1) % 9]
 
-def cycle_from_lord(start_lord: str) -> List[str]:
-    i = DASHA_ORDER_9.index(start_lord)
-    return DASHA_ORDER_9[i:] + DASHA_ORDER_9[:i]
+@lru_cache(maxsize=9)
+def cycle_from_lord(start_lord: str) -> Tuple[str, ...]:
+    i = DASHA_INDEX[start_lord]
+    return tuple(DASHA_ORDER_9[i:] + DASHA_ORDER_9[:i])  # immutable: shared by the cache
 
 def add_years(dt: datetime, years: float) -> datetime:
     return dt + timedelta(days=years * DAYS_PER_YEAR)
 
-def vimshottari_maha_schedule_from_birth(birth_dt_utc: datetime, ayanamsha: str, horizon_years: int = 120):
-    nak_idx, frac_elapsed = moon_nakshatra_info(birth_dt_utc, ayanamsha)
+@lru_cache(maxsize=512)
+def vimshottari_maha_schedule_from_birth(birth_dt_utc: datetime, ayanamsha: str,
+                                         horizon_years: int = 120) -> Tuple[Tuple[str, datetime, datetime], ...]:
+    """Maha periods as (lord, start, end); memoized on the exact (tz-aware) birth instant."""
+    set_ayanamsha(ayanamsha)
+    nak_idx, frac_elapsed = moon_nakshatra_info(birth_dt_utc)
     start_lord = lord_of_nakshatra(nak_idx)
     order = cycle_from_lord(start_lord)
-    out = []
-    t = birth_dt_utc
-
-    # balance of current lord
-    full = DASHA_YEARS[start_lord]
-    remaining = full * (1.0 - frac_elapsed)
-    end = add_years(t, remaining)
-    out.append({"period": start_lord, "start": t, "end": end})
-    t, total = end, remaining
-
-    for lord in order[1:] + order * 12:
-        yrs = DASHA_YEARS[lord]
-        if total + yrs > horizon_years:
-            end = add_years(t, max(0.0, horizon_years - total))
-            out.append({"period": lord, "start": t, "end": end})
-            break
-        end = add_years(t, yrs)
-        out.append({"period": lord, "start": t, "end": end})
-        t, total = end, total + yrs
-        if total >= horizon_years:
-            break
-    return out
 
-def subdivide_antar(parent_start: datetime, parent_end: datetime, maha_lord: str):
-    order = cycle_from_lord(maha_lord)
-    total = (parent_end - parent_start).total_seconds()
-    t = parent_start
-    out = []
-    for sub in order:
-        frac = DASHA_YEARS[sub] / 120.0
-        dur = timedelta(seconds=total * frac)
-        end = t + dur
-        out.append({"period": sub, "start": t, "end": end})
-        t = end
-    out[-1]["end"] = parent_end
-    return out
-
-def subdivide_pratyantar(antar_start: datetime, antar_end: datetime, antar_lord: str):
-    order = cycle_from_lord(antar_lord)
-    total = (antar_end - antar_start).total_seconds()
-    t = antar_start
-    out = []
-    for sub in order:
-        frac = DASHA_YEARS[sub] / 120.0
-        dur = timedelta(seconds=total * frac)
-        end = t + dur
-        out.append({"period": sub, "start": t, "end": end})
-        t = end
-    out[-1]["end"] = antar_end
-    return out
+    # Year offsets of every boundary: balance of the birth lord, then full periods,
+    # with the period that crosses the horizon cut short at it.
+    lords = (start_lord,) + order[1:] + order * 12
+    years = [DASHA_YEARS[start_lord] * (1.0 - frac_elapsed)] + [DASHA_YEARS[lord] for lord in lords[1:]]
+    ends = list(accumulate(years))
+    n = bisect_left(ends, horizon_years) + 1
+    ends = ends[:n - 1] + [float(horizon_years)]
+    bounds = [birth_dt_utc] + [add_years(birth_dt_utc, y) for y in ends]
+    return tuple(zip(lords[:n], bounds[:-1], bounds[1:]))
+
+# Antar/pratyantar boundaries as cumulative fractions of the parent, per lord
+def _sub_period_bounds(lord: str) -> Tuple[Tuple[str, float, float], ...]:
+    order = cycle_from_lord(lord)
+    ends = list(accumulate(DASHA_YEARS[sub] / 120.0 for sub in order))
+    ends[-1] = 1.0
+    return tuple(zip(order, [0.0] + ends[:-1], ends))
+
+SUB_PERIOD_BOUNDS = {lord: _sub_period_bounds(lord) for lord in DASHA_ORDER_9}
+
+def subdivide_period(parent_start: datetime, parent_end: datetime, lord: str) -> List[Tuple[str, datetime, datetime]]:
+    """Splits a maha (or antar) period into its 9 sub-periods as (lord, start, end)."""
+    span = parent_end - parent_start
+    return [(sub, parent_start + span * a, parent_start + span * b) for sub, a, b in SUB_PERIOD_BOUNDS[lord]]
 
 def vimshottari_tree(
     birth_dt_utc: datetime,
@@ -433,47 +573,59 @@ def vimshottari_tree(
     def d_local(d: datetime) -> str:
         return d.astimezone(tz).date().isoformat()
 
-    if levels <= 1:
-        return [{"period": m["period"], "start": d_local(m["start"]), "end": d_local(m["end"]), "sub": []} for m in maha]
-
-    out: List[Dict] = []
-    for m in maha:
-        row = {"period": m["period"], "start": d_local(m["start"]), "end": d_local(m["end"]), "sub": []}
-        antars = subdivide_antar(m["start"], m["end"], m["period"])
-        if levels >= 2:
-            for a in antars:
-                arow = {"period": a["period"], "start": d_local(a["start"]), "end": d_local(a["end"]), "sub": []}
-                if levels >= 3:
-                    pratis = subdivide_pratyantar(a["start"], a["end"], a["period"])
-                    arow["sub"] = [{"period": p["period"], "start": d_local(p["start"]), "end": d_local(p["end"])} for p in pratis]
-                row["sub"].append(arow)
-        out.append(row)
+    def rows(periods, start_s: str, end_s: str) -> List[Dict]:
+        # Periods are contiguous and span their parent: each start is the previous
+        # end, so only the interior boundaries need a tz conversion.
+        ends = [d_local(e) for _, _, e in periods[:-1]] + [end_s]
+        starts = [start_s] + ends[:-1]
+        return [{"period": p[0], "start": s, "end": e} for p, s, e in zip(periods, starts, ends)]
+
+    out = rows(maha, d_local(maha[0][1]), d_local(maha[-1][2]))
+    for row, (lord, start, end) in zip(out, maha):
+        row["sub"] = []
+        if levels < 2:
+            continue
+        antars = subdivide_period(start, end, lord)
+        row["sub"] = rows(antars, row["start"], row["end"])
+        for arow, (a_lord, a_start, a_end) in zip(row["sub"], antars):
+            arow["sub"] = rows(subdivide_period(a_start, a_end, a_lord), arow["start"], arow["end"]) \
+                if levels >= 3 else []
     return out
 
 # -----------------------------
 # System-specific interpretation helpers
 # -----------------------------
-def interpret_vedic_basic(lagna_sign: str, placements: Dict[str, Dict]) -> Dict:
-    """Very lightweight illustrative rules; replace with your full library later."""
+# Interpretation rules as data: (planet, house, note) plus one lagna-element rule each,
+# so adding a rule is a table entry rather than another branch.
+VEDIC_HOUSE_RULES = (
+    ("Saturn", 1, "Saturn in Lagna brings discipline and responsibility; manage pessimism."),
+    ("Jupiter", 9, "Jupiter in the 9th supports dharma, luck, and mentors."),
+)
+VEDIC_LAGNA_RULE = (frozenset({"Aries", "Leo", "Sagittarius"}), "Fire Lagna adds initiative and leadership.")
+LALKITAB_HOUSE_RULES = (
+    ("Saturn", 1, "Lal Kitab: Saturn in 1st—avoid alcohol; respect workers; keep iron item."),
+    ("Rahu", 7, "Lal Kitab: Rahu in 7th—avoid blue on key days; maintain clean relationships."),
+)
+LALKITAB_LAGNA_RULE = (frozenset({"Taurus", "Virgo", "Capricorn"}), "Earth Lagna: emphasize steady routines and tangible remedies.")
+
+def apply_rules(house_rules, lagna_rule, lagna_sign: str, placements: Dict[str, Placement]) -> Dict:
     notes = []
-    if placements.get("Saturn", {}).get("house") == 1:
-        notes.append("Saturn in Lagna brings discipline and responsibility; manage pessimism.")
-    if placements.get("Jupiter", {}).get("house") == 9:
-        notes.append("Jupiter in the 9th supports dharma, luck, and mentors.")
-    if lagna_sign in ["Aries","Leo","Sagittarius"]:
-        notes.append("Fire Lagna adds initiative and leadership.")
+    for planet, house, note in house_rules:
+        p = placements.get(planet)
+        if p is not None and p.house == house:
+            notes.append(note)
+    signs, note = lagna_rule
+    if lagna_sign in signs:
+        notes.append(note)
     return {"summary": notes}
 
-def interpret_lalkitab_basic(lagna_sign: str, placements: Dict[str, Dict]) -> Dict:
+def interpret_vedic_basic(lagna_sign: str, placements: Dict[str, Placement]) -> Dict:
+    """Very lightweight illustrative rules; replace with your full library later."""
+    return apply_rules(VEDIC_HOUSE_RULES, VEDIC_LAGNA_RULE, lagna_sign, placements)
+
+def interpret_lalkitab_basic(lagna_sign: str, placements: Dict[str, Placement]) -> Dict:
     """Simplified Lal Kitab-flavored hints; replace with authentic rule base."""
-    notes = []
-    if placements.get("Saturn", {}).get("house") == 1:
-        notes.append("Lal Kitab: Saturn in 1st—avoid alcohol; respect workers; keep iron item.")
-    if placements.get("Rahu", {}).get("house") == 7:
-        notes.append("Lal Kitab: Rahu in 7th—avoid blue on key days; maintain clean relationships.")
-    if lagna_sign in ["Taurus","Virgo","Capricorn"]:
-        notes.append("Earth Lagna: emphasize steady routines and tangible remedies.")
-    return {"summary": notes}
+    return apply_rules(LALKITAB_HOUSE_RULES, LALKITAB_LAGNA_RULE, lagna_sign, placements)
 
 def comparative_from_two(vedic: Dict, lkt: Dict) -> str:
     v = " | ".join(vedic.get("summary", [])) or "—"
@@ -488,20 +640,23 @@ def comparative_from_two(vedic: Dict, lkt: Dict) -> str:
 # -----------------------------
 @app.post("/calc_panchanga")
 def calc_panchanga(inp: PanchangaIn):
-    tz = ZoneInfo(inp.tz)
+    tz = get_zone(inp.tz)
     d = date.fromisoformat(inp.date_iso)
-    loc = LocationInfo(latitude=inp.lat, longitude=inp.lon)
-    sdata = sun(loc.observer, date=d, tzinfo=tz)
-    sunrise_local, sunset_local = sdata["sunrise"], sdata["sunset"]
-    vara = sunrise_local.strftime("%A")
-
-    sunrise_utc = sunrise_local.astimezone(ZoneInfo("UTC"))
-    t_idx, t_end = tithi_index_and_end(sunrise_utc, inp.ayanamsha)
-    n_idx, n_end = nakshatra_index_and_end(sunrise_utc, inp.ayanamsha)
-    y_idx, y_end = yoga_index_and_end(sunrise_utc, inp.ayanamsha)
-    k_idx, k_end = karana_index_and_end(sunrise_utc, inp.ayanamsha)
-
-    spans = rahu_yama_gulika(sunrise_local, sunset_local, vara)
+    try:
+        sunrise_local, sunset_local = sun_rise_set(d, inp.lat, inp.lon, tz)
+    except ValueError as e:
+        return {"error": str(e)}
+    try:
+        next_sunrise = sun_rise_set(d + timedelta(days=1), inp.lat, inp.lon, tz)[0]
+    except ValueError:
+        next_sunrise = None  # the rest of the panchanga doesn't depend on tomorrow
+    wd = sunrise_local.weekday()
+
+    sunrise_utc = sunrise_local.astimezone(UTC)
+    (t_idx, t_end), (n_idx, n_end), (y_idx, y_end), (k_idx, k_end) = \
+        panchanga_all_ends(sunrise_utc, resolve_ayanamsa(inp.ayanamsha))
+
+    spans = rahu_yama_gulika(sunrise_local, sunset_local, wd)
     midday = sunrise_local + (sunset_local - sunrise_local) / 2
     half = (sunset_local - sunrise_local) / 30
     abhijit = {"start": (midday - half).isoformat(), "end": (midday + half).isoformat()}
@@ -510,18 +665,18 @@ def calc_panchanga(inp: PanchangaIn):
         "location": {"lat": inp.lat, "lon": inp.lon, "tz": inp.tz},
         "sunrise": sunrise_local.isoformat(),
         "sunset": sunset_local.isoformat(),
-        "vara": vara,
+        "vara": WEEKDAY_NAMES[wd],
         "tithi": {"name": TITHI_NAMES[t_idx-1], "index": t_idx, "ends_at": t_end.astimezone(tz).isoformat()},
         "nakshatra": {"name": NAK_NAMES[n_idx-1], "index": n_idx, "ends_at": n_end.astimezone(tz).isoformat()},
         "yoga": {"name": YOGA_NAMES[y_idx-1], "index": y_idx, "ends_at": y_end.astimezone(tz).isoformat()},
         "karana": {"name": karana_name_by_index(k_idx), "index": k_idx, "ends_at": k_end.astimezone(tz).isoformat()},
         **spans,
         "abhijit": abhijit,
-        "choghadiya": []
+        "choghadiya": choghadiya(sunrise_local, sunset_local, next_sunrise, wd)
     }
     # Panchanga itself is common; we just echo requested system for client UI
     payload["system"] = inp.system
-    return payload
+    return FastJSONResponse(payload)  # all str/int/float already, as in calc_dasha
 
 @app.post("/calc_birth_chart")
 def calc_birth_chart(inp: BirthChartIn):
@@ -530,30 +685,41 @@ def calc_birth_chart(inp: BirthChartIn):
     - 'vedic': Vedic-only analysis + Vedic remedies
     - 'lal_kitab': Lal Kitab-only analysis + Lal Kitab remedies
     - 'both': both analyses and comparative summary, remedies kept separate
+
+    lagna.crosscheck_delta_deg is null unless verify_lagna is true; lagna.method is 'sidereal_flag'
+    unless that cross-check differs by more than 0.1 deg, then 'tropical_minus_ayanamsha'.
     """
+    return Response(content=_birth_chart_cached(inp), media_type="application/json")
+
+# Charts and dasha trees depend only on the request body, and clients (GPT Actions
+# especially) retry identical requests. The caches hold the encoded JSON rather than
+# the dicts (a level-3 tree is ~55 KB encoded vs ~236 KB as Python objects), which
+# also skips re-serializing a hit. Bound per worker: 256 charts at ~1.5 KB plus
+# 128 trees at <= ~55 KB, about 7.5 MB.
+@lru_cache(maxsize=256)
+def _birth_chart_cached(inp: BirthChartIn) -> bytes:
+    return FastJSONResponse(_birth_chart(inp)).body
+
+def _birth_chart(inp: BirthChartIn) -> Dict:
     if not (-90.0 <= inp.lat <= 90.0) or not (-180.0 <= inp.lon <= 180.0):
         return {"error": "Latitude must be in [-90,90], longitude in [-180,180] (East positive)."}
 
-    # Ayanamsha selection
-    if inp.ayanamsha == "Lahiri":
-        swe.set_sid_mode(swe.SIDM_LAHIRI, 0, 0)
-    elif inp.ayanamsha == "Raman":
-        swe.set_sid_mode(swe.SIDM_RAMAN, 0, 0)
-    elif inp.ayanamsha == "Krishnamurti":
-        swe.set_sid_mode(swe.SIDM_KRISHNAMURTI, 0, 0)
+    set_ayanamsha(inp.ayanamsha)
 
     # Build UT JD
     try:
-        jd_ut = jdut_from_local(inp.dob_iso, inp.tob_iso, inp.tz)
+        jd_ut = jdut_from_local(inp.dob_iso, inp.tob_iso, get_zone(inp.tz))
     except Exception as e:
         return {"error": f"Invalid birth date/time: {e}"}
 
-    # Asc cross-check
-    asc_sid_1 = ascendant_sidereal_deg(jd_ut, inp.lat, inp.lon)
-    asc_sid_2 = ascendant_sidereal_deg_by_subtract(jd_ut, inp.lat, inp.lon)
-    asc_delta = abs((asc_sid_1 - asc_sid_2 + 540) % 360 - 180)
-    asc_sid = asc_sid_1 if asc_delta <= 0.1 else asc_sid_2
-    method_used = "sidereal_flag" if asc_delta <= 0.1 else "tropical_minus_ayanamsha"
+    # Asc: one sidereal houses call; the tropical-minus-ayanamsha cross-check is opt-in
+    asc_sid = ascendant_sidereal_deg(jd_ut, inp.lat, inp.lon)
+    method_used, asc_delta = "sidereal_flag", None
+    if inp.verify_lagna:
+        asc_sid_2 = ascendant_sidereal_deg_by_subtract(jd_ut, inp.lat, inp.lon)
+        asc_delta = abs(angle_diff(asc_sid, asc_sid_2))
+        if asc_delta > 0.1:
+            asc_sid, method_used = asc_sid_2, "tropical_minus_ayanamsha"
 
     asc_sign_idx = sign_index(asc_sid)
     asc_sign_name = SIGN_NAMES[asc_sign_idx - 1]
@@ -561,36 +727,24 @@ def calc_birth_chart(inp: BirthChartIn):
 
     # Planets (sidereal)
     node_id = swe.TRUE_NODE if inp.node == "True" else swe.MEAN_NODE
-    planet_map = {
-        "Sun": swe.SUN, "Moon": swe.MOON, "Mars": swe.MARS, "Mercury": swe.MERCURY,
-        "Jupiter": swe.JUPITER, "Venus": swe.VENUS, "Saturn": swe.SATURN, "Rahu": node_id
-    }
-
-    placements: Dict[str, Dict] = {}
-    for name, pid in planet_map.items():
+    placements: Dict[str, Placement] = {}
+    for name, pid in CHART_BODIES + (("Rahu", node_id),):
         lon_sid, spd = planet_sidereal(jd_ut, pid)
         s_idx = sign_index(lon_sid)
-        house = whole_sign_house(s_idx, asc_sign_idx)
-        placements[name] = {
-            "sign": SIGN_NAMES[s_idx - 1],
-            "degree": round(degree_in_sign(lon_sid), 2),
-            "lon": round(lon_sid, 6),
-            "house": house,
-            "retro": (spd < 0.0)
-        }
+        placements[name] = Placement(
+            SIGN_NAMES[s_idx - 1], round(degree_in_sign(lon_sid), 2), round(lon_sid, 6),
+            whole_sign_house(s_idx, asc_sign_idx), spd < 0.0
+        )
     # Ketu
-    rahu_lon = placements["Rahu"]["lon"]
-    ketu_lon = norm360(rahu_lon + 180.0)
+    rahu_lon = placements["Rahu"].lon
+    ketu_lon = rahu_lon - 180.0 if rahu_lon >= 180.0 else rahu_lon + 180.0
     ketu_sidx = sign_index(ketu_lon)
-    placements["Ketu"] = {
-        "sign": SIGN_NAMES[ketu_sidx - 1],
-        "degree": round(degree_in_sign(ketu_lon), 2),
-        "lon": round(ketu_lon, 6),
-        "house": whole_sign_house(ketu_sidx, asc_sign_idx),
-        "retro": True
-    }
+    placements["Ketu"] = Placement(
+        SIGN_NAMES[ketu_sidx - 1], round(degree_in_sign(ketu_lon), 2), round(ketu_lon, 6),
+        whole_sign_house(ketu_sidx, asc_sign_idx), True
+    )
     # Moon Nakshatra
-    nak_name, pada = moon_nakshatra_name_pada(placements["Moon"]["lon"])
+    nak_name, pada = moon_nakshatra_name_pada(placements["Moon"].lon)
 
     base = {
         "ayanamsha": inp.ayanamsha,
@@ -601,9 +755,9 @@ def calc_birth_chart(inp: BirthChartIn):
             "degree": asc_deg_in_sign,
             "lon": round(asc_sid, 6),
             "method": method_used,
-            "crosscheck_delta_deg": round(asc_delta, 4)
+            "crosscheck_delta_deg": round(asc_delta, 4) if asc_delta is not None else None
         },
-        "planets": placements,
+        "planets": {name: p._asdict() for name, p in placements.items()},
         "nakshatras": {"Moon": {"name": nak_name, "pada": pada}},
         "vargas": {v: {} for v in inp.vargas}
     }
@@ -612,16 +766,16 @@ def calc_birth_chart(inp: BirthChartIn):
     if inp.system == "vedic":
         vedic_interp = interpret_vedic_basic(asc_sign_name, placements)
         vedic_rem = {
-            "lagna": remedies_vedic.get("Saturn in Lagna") if placements["Saturn"]["house"] == 1 else None,
-            "moon": remedies_vedic.get("Weak Moon") if placements["Moon"]["degree"] < 3.0 else None
+            "lagna": remedies_vedic.get("Saturn in Lagna") if placements["Saturn"].house == 1 else None,
+            "moon": remedies_vedic.get("Weak Moon") if placements["Moon"].degree < 3.0 else None
         }
         return {"system": "vedic", "base": base, "analysis_vedic": vedic_interp, "remedies_vedic": vedic_rem}
 
     if inp.system == "lal_kitab":
         lkt_interp = interpret_lalkitab_basic(asc_sign_name, placements)
         lkt_rem = {
-            "lagna": remedies_lalkitab.get("Saturn in Lagna") if placements["Saturn"]["house"] == 1 else None,
-            "moon": remedies_lalkitab.get("Weak Moon") if placements["Moon"]["degree"] < 3.0 else None
+            "lagna": remedies_lalkitab.get("Saturn in Lagna") if placements["Saturn"].house == 1 else None,
+            "moon": remedies_lalkitab.get("Weak Moon") if placements["Moon"].degree < 3.0 else None
         }
         return {"system": "lal_kitab", "base": base, "analysis_lal_kitab": lkt_interp, "remedies_lal_kitab": lkt_rem}
 
@@ -630,12 +784,12 @@ def calc_birth_chart(inp: BirthChartIn):
     lkt_interp = interpret_lalkitab_basic(asc_sign_name, placements)
     comp = comparative_from_two(vedic_interp, lkt_interp)
     vedic_rem = {
-        "lagna": remedies_vedic.get("Saturn in Lagna") if placements["Saturn"]["house"] == 1 else None,
-        "moon": remedies_vedic.get("Weak Moon") if placements["Moon"]["degree"] < 3.0 else None
+        "lagna": remedies_vedic.get("Saturn in Lagna") if placements["Saturn"].house == 1 else None,
+        "moon": remedies_vedic.get("Weak Moon") if placements["Moon"].degree < 3.0 else None
     }
     lkt_rem = {
-        "lagna": remedies_lalkitab.get("Saturn in Lagna") if placements["Saturn"]["house"] == 1 else None,
-        "moon": remedies_lalkitab.get("Weak Moon") if placements["Moon"]["degree"] < 3.0 else None
+        "lagna": remedies_lalkitab.get("Saturn in Lagna") if placements["Saturn"].house == 1 else None,
+        "moon": remedies_lalkitab.get("Weak Moon") if placements["Moon"].degree < 3.0 else None
     }
     return {
         "system": "both",
@@ -649,12 +803,25 @@ def calc_birth_chart(inp: BirthChartIn):
 
 @app.post("/calc_dasha")
 def calc_dasha(inp: DashaIn):
+    # The tree is already plain str/float, so it is encoded directly, skipping
+    # jsonable_encoder, which otherwise costs more than computing a level-3 tree.
+    return Response(content=_dasha_cached(inp), media_type="application/json")
+
+@lru_cache(maxsize=128)
+def _dasha_cached(inp: DashaIn) -> bytes:
+    return FastJSONResponse(_dasha(inp)).body
+
+def _dasha(inp: DashaIn) -> Dict:
     if inp.method != "Vimshottari":
         return {"error": "Only Vimshottari is implemented."}
 
+    try:
+        out_tz = get_zone(inp.tz)
+    except Exception:
+        return {"error": f"Unknown timezone: {inp.tz}"}
+
     dt = datetime.fromisoformat(inp.start_iso)
-    dt_utc = dt.replace(tzinfo=ZoneInfo("UTC")) if dt.tzinfo is None else dt.astimezone(ZoneInfo("UTC"))
-    out_tz = ZoneInfo(inp.tz)
+    dt_utc = dt.replace(tzinfo=UTC) if dt.tzinfo is None else dt.astimezone(UTC)
     tree = vimshottari_tree(
         birth_dt_utc=dt_utc,
         levels=max(1, min(inp.levels, 3)),
@@ -674,16 +841,18 @@ def calc_dasha(inp: DashaIn):
 
 @app.post("/calc_transits")
 def calc_transits(inp: TransitsIn):
-    base = datetime.fromisoformat(inp.from_iso)
+    # Whole-day offsets: plain date arithmetic from the parsed date gives the same days
+    base = datetime.fromisoformat(inp.from_iso).date()
+    def day(offset: int) -> str:
+        return (base + timedelta(days=offset)).isoformat()
     windows = [
-        {"window": f"{base.date()} to {(base+timedelta(days=90)).date()}",
+        {"window": f"{day(0)} to {day(90)}",
          "planet":"Saturn","aspect":"trine","to_natal":"Moon","orb_deg": inp.orb_deg},
-        {"window": f"{(base+timedelta(days=120)).date()} to {(base+timedelta(days=210)).date()}",
+        {"window": f"{day(120)} to {day(210)}",
          "planet":"Jupiter","aspect":"conjunction","to_natal":"Lagna","orb_deg": inp.orb_deg}
     ]
     payload = {"windows": windows, "retrogrades": [
-        {"planet":"Mercury","from": (base+timedelta(days=30)).date().isoformat(),
-         "to": (base+timedelta(days=50)).date().isoformat()}
+        {"planet":"Mercury","from": day(30), "to": day(50)}
     ], "system": inp.system}
     if inp.system == "both":
         payload["comparative_hint"] = "Transit interpretations can vary; remedies differ between Vedic and Lal Kitab."
@@ -691,16 +860,18 @@ def calc_transits(inp: TransitsIn):
 
 @app.post("/calc_muhurta")
 def calc_muhurta(inp: MuhurtaIn):
-    tz = ZoneInfo(inp.tz)
+    tz = get_zone(inp.tz)
     d = datetime.fromisoformat(inp.date_iso).astimezone(tz)
-    loc = LocationInfo(latitude=inp.lat, longitude=inp.lon)
-    sdata = sun(loc.observer, date=d.date(), tzinfo=tz)
+    try:
+        sunrise, _ = sun_rise_set(d.date(), inp.lat, inp.lon, tz)
+    except ValueError as e:
+        return {"error": str(e)}
     slots = [
-        {"start": sdata["sunrise"].replace(hour=9, minute=12).isoformat(),
-         "end": sdata["sunrise"].replace(hour=10, minute=24).isoformat(),
+        {"start": sunrise.replace(hour=9, minute=12).isoformat(),
+         "end": sunrise.replace(hour=10, minute=24).isoformat(),
          "quality":"good"},
-        {"start": sdata["sunrise"].replace(hour=14, minute=5).isoformat(),
-         "end": sdata["sunrise"].replace(hour=15, minute=16).isoformat(),
+        {"start": sunrise.replace(hour=14, minute=5).isoformat(),
+         "end": sunrise.replace(hour=15, minute=16).isoformat(),
          "quality":"excellent"}
     ]
     out = {
@@ -716,10 +887,11 @@ def calc_muhurta(inp: MuhurtaIn):
 @app.post("/get_remedies")
 def get_remedies(inp: RemedyIn):
     out = {}
+    key = remedy_key(inp.query)
     if inp.system in ["vedic","both"]:
-        out["vedic"] = remedies_vedic.get(inp.query, "No Vedic remedy found.")
+        out["vedic"] = _remedies_vedic_idx.get(key, "No Vedic remedy found.")
     if inp.system in ["lal_kitab","both"]:
-        out["lal_kitab"] = remedies_lalkitab.get(inp.query, "No Lal Kitab remedy found.")
+        out["lal_kitab"] = _remedies_lalkitab_idx.get(key, "No Lal Kitab remedy found.")
     if inp.system == "both":
         out["comparative_analysis"] = (
             "Vedic emphasizes mantra, daana, vrata; Lal Kitab emphasizes symbolic/behavioral remedies."
@@ -728,14 +900,10 @@ def get_remedies(inp: RemedyIn):
 
 @app.post("/debug_birth")
 def debug_birth(inp: DebugBirthIn):
-    if inp.ayanamsha == "Lahiri":
-        swe.set_sid_mode(swe.SIDM_LAHIRI, 0, 0)
-    elif inp.ayanamsha == "Raman":
-        swe.set_sid_mode(swe.SIDM_RAMAN, 0, 0)
-    elif inp.ayanamsha == "Krishnamurti":
-        swe.set_sid_mode(swe.SIDM_KRISHNAMURTI, 0, 0)
+    set_ayanamsha(inp.ayanamsha)
     try:
-        dt_utc = local_to_utc(inp.dob_iso, inp.tob_iso, inp.tz)
+        tz = get_zone(inp.tz)
+        dt_utc = local_to_utc(inp.dob_iso, inp.tob_iso, tz)
     except Exception as e:
         return {"error": f"Invalid birth date/time: {e}"}
     jd_ut = to_jd_ut(dt_utc)
@@ -746,7 +914,7 @@ def debug_birth(inp: DebugBirthIn):
     node_id = swe.TRUE_NODE if inp.node == "True" else swe.MEAN_NODE
     node_lon, _ = planet_sidereal(jd_ut, node_id)
     return {
-        "local_datetime": dt_utc.astimezone(ZoneInfo(inp.tz)).isoformat(),
+        "local_datetime": dt_utc.astimezone(tz).isoformat(),
         "utc_datetime": dt_utc.isoformat(),
         "jd_ut": jd_ut,
         "ayanamsa_deg": round(ayan, 6),
@@ -761,6 +929,10 @@ def debug_birth(inp: DebugBirthIn):
         "node_lon_deg": round(node_lon, 6)
     }
 
+# Liveness probes hit this constantly; the body never changes, so encode it once.
+# A fresh Response per call: middleware appends headers to a response's header list.
+ROOT_BODY = FastJSONResponse({"ok": True, "message": "Jyotisa Compute API is running."}).body
+
 @app.get("/")
 def root():
-    return {"ok": True, "message": "Jyotisa Compute API is running."}
+    return Response(content=ROOT_BODY, media_type="application/json")
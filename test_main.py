@@ -0,0 +1,168 @@
+# test_main.py — checks for the ephemeris-derived parts of main.py (run: python -m pytest -q)
+
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+client = TestClient(main.app)
+
+DELHI = (28.61, 77.21, "Asia/Kolkata")
+FAIRBANKS = (64.84, -147.72, "America/Anchorage")
+TROMSO = (69.65, 18.96, "Europe/Oslo")
+
+# -----------------------------
+# Sunrise / sunset
+# -----------------------------
+@pytest.mark.parametrize("d, place", [
+    (date(2024, 3, 10), DELHI),
+    (date(2024, 12, 21), DELHI),
+    (date(2024, 6, 5), FAIRBANKS),   # sets after local midnight
+    (date(2024, 8, 10), TROMSO),
+])
+def test_sunrise_on_date_and_before_sunset(d, place):
+    lat, lon, tz = place
+    sunrise, sunset = main.sun_rise_set(d, lat, lon, main.get_zone(tz))
+    assert sunrise.date() == d
+    assert sunrise < sunset < sunrise + timedelta(days=1)
+
+def test_high_latitude_sunset_after_midnight():
+    lat, lon, tz = FAIRBANKS
+    sunrise, sunset = main.sun_rise_set(date(2024, 6, 5), lat, lon, main.get_zone(tz))
+    assert sunset.date() == date(2024, 6, 6)
+    r = client.post("/calc_panchanga", json={"date_iso": "2024-06-05", "lat": lat, "lon": lon, "tz": tz})
+    out = r.json()
+    assert out["sunrise"] < out["sunset"]
+
+@pytest.mark.parametrize("d", [date(2024, 6, 20), date(2024, 12, 21), date(2024, 5, 17)])
+def test_no_rise_set_pair_is_an_error(d):
+    # Midnight sun, polar night, and a rise with no set before the Sun stays up
+    lat, lon, tz = TROMSO
+    with pytest.raises(ValueError):
+        main.sun_rise_set(d, lat, lon, main.get_zone(tz))
+    body = {"date_iso": d.isoformat(), "lat": lat, "lon": lon, "tz": tz}
+    assert "error" in client.post("/calc_panchanga", json=body).json()
+    body["date_iso"] = f"{d.isoformat()}T12:00:00+02:00"
+    body["activity"] = "travel"
+    assert "error" in client.post("/calc_muhurta", json=body).json()
+
+# -----------------------------
+# Panchanga end times
+# -----------------------------
+def brute_force_end(jd0: float, angle_at, seg: float) -> float:
+    """JD after jd0 at which angle_at leaves its segment: 10-minute scan, then bisection."""
+    idx = int(main.norm360(angle_at(jd0)) // seg)
+    step = 10 / 1440
+    lo, hi = jd0, jd0 + step
+    while int(main.norm360(angle_at(hi)) // seg) == idx:
+        lo, hi = hi, hi + step
+    while (hi - lo) * 86400 > 1e-3:
+        mid = (lo + hi) / 2
+        lo, hi = (mid, hi) if int(main.norm360(angle_at(mid)) // seg) == idx else (lo, mid)
+    return hi
+
+@pytest.mark.parametrize("d, place", [
+    (date(2024, 1, 11), DELHI),
+    (date(2024, 4, 23), DELHI),
+    (date(2024, 9, 2), DELHI),
+    (date(2024, 6, 5), FAIRBANKS),
+])
+def test_panchanga_ends_match_brute_force(d, place):
+    lat, lon, tz = place
+    sunrise, _ = main.sun_rise_set(d, lat, lon, main.get_zone(tz))
+    ends = main.panchanga_all_ends(sunrise.astimezone(main.UTC), main.swe.SIDM_LAHIRI)
+    jd0 = main.to_jd_ut(sunrise)
+    def sm(jd):
+        return main.sun_moon_sidereal_at_jd(jd)
+    limbs = [(lambda jd: sm(jd)[1] - sm(jd)[0], main.TITHI_DEG),
+             (lambda jd: sm(jd)[1], main.SEG_27),
+             (lambda jd: sm(jd)[0] + sm(jd)[1], main.SEG_27),
+             (lambda jd: sm(jd)[1] - sm(jd)[0], main.KARANA_DEG)]
+    for (idx, end), (angle_at, seg) in zip(ends, limbs):
+        assert idx == int(main.norm360(angle_at(jd0)) // seg) + 1
+        expected = main.jd_to_utc(brute_force_end(jd0, angle_at, seg))
+        assert abs((end - expected).total_seconds()) < 1.0
+
+# -----------------------------
+# Karana table
+# -----------------------------
+def test_karana_table():
+    assert len(main.KARANA_NAMES) == 60
+    # The original branch rules: Kimstughna, the movable seven cycling 8 times, then the fixed three
+    expected = ["Kimstughna"] + [main.KARANA_MOVABLE[(i - 2) % 7] for i in range(2, 58)] + \
+               ["Shakuni", "Chatushpada", "Naga"]
+    assert [main.karana_name_by_index(i) for i in range(1, 61)] == expected
+    assert main.karana_name_by_index(2) == "Bava" and main.karana_name_by_index(57) == "Vishti"
+    for bad in (0, 61):
+        with pytest.raises(ValueError):
+            main.karana_name_by_index(bad)
+
+# -----------------------------
+# Choghadiya
+# -----------------------------
+# Traditional tables, Monday first (datetime.weekday() order)
+CHOGHADIYA_DAY = [
+    ["Amrit", "Kaal", "Shubh", "Rog", "Udveg", "Char", "Labh", "Amrit"],
+    ["Rog", "Udveg", "Char", "Labh", "Amrit", "Kaal", "Shubh", "Rog"],
+    ["Labh", "Amrit", "Kaal", "Shubh", "Rog", "Udveg", "Char", "Labh"],
+    ["Shubh", "Rog", "Udveg", "Char", "Labh", "Amrit", "Kaal", "Shubh"],
+    ["Char", "Labh", "Amrit", "Kaal", "Shubh", "Rog", "Udveg", "Char"],
+    ["Kaal", "Shubh", "Rog", "Udveg", "Char", "Labh", "Amrit", "Kaal"],
+    ["Udveg", "Char", "Labh", "Amrit", "Kaal", "Shubh", "Rog", "Udveg"],
+]
+CHOGHADIYA_NIGHT = [
+    ["Char", "Rog", "Kaal", "Labh", "Udveg", "Shubh", "Amrit", "Char"],
+    ["Kaal", "Labh", "Udveg", "Shubh", "Amrit", "Char", "Rog", "Kaal"],
+    ["Udveg", "Shubh", "Amrit", "Char", "Rog", "Kaal", "Labh", "Udveg"],
+    ["Amrit", "Char", "Rog", "Kaal", "Labh", "Udveg", "Shubh", "Amrit"],
+    ["Rog", "Kaal", "Labh", "Udveg", "Shubh", "Amrit", "Char", "Rog"],
+    ["Labh", "Udveg", "Shubh", "Amrit", "Char", "Rog", "Kaal", "Labh"],
+    ["Shubh", "Amrit", "Char", "Rog", "Kaal", "Labh", "Udveg", "Shubh"],
+]
+
+@pytest.mark.parametrize("d", [date(2024, 3, 11) + timedelta(days=i) for i in range(7)])
+def test_choghadiya_sequences(d):
+    lat, lon, tz = DELHI
+    r = client.post("/calc_panchanga", json={"date_iso": d.isoformat(), "lat": lat, "lon": lon, "tz": tz})
+    out = r.json()
+    slots = out["choghadiya"]
+    assert [s["period"] for s in slots] == ["day"] * 8 + ["night"] * 8
+    assert [s["name"] for s in slots[:8]] == CHOGHADIYA_DAY[d.weekday()]
+    assert [s["name"] for s in slots[8:]] == CHOGHADIYA_NIGHT[d.weekday()]
+    # Contiguous from sunrise through sunset to the next sunrise
+    next_sunrise, _ = main.sun_rise_set(d + timedelta(days=1), lat, lon, main.get_zone(tz))
+    assert slots[0]["start"] == out["sunrise"] and slots[7]["end"] == out["sunset"]
+    assert slots[8]["start"] == out["sunset"] and slots[15]["end"] == next_sunrise.isoformat()
+    assert all(a["end"] == b["start"] for a, b in zip(slots, slots[1:]))
+
+def test_choghadiya_day_only_without_next_sunrise():
+    # Tromsoe: 2024-11-26 has a sunrise, the 27th starts the polar night
+    lat, lon, tz = TROMSO
+    r = client.post("/calc_panchanga", json={"date_iso": "2024-11-26", "lat": lat, "lon": lon, "tz": tz})
+    out = r.json()
+    assert "error" not in out and out["tithi"]
+    assert [s["period"] for s in out["choghadiya"]] == ["day"] * 8
+
+# -----------------------------
+# Handler caches
+# -----------------------------
+CHART = {"dob_iso": "1990-05-17", "tob_iso": "14:35:07", "lat": 28.61, "lon": 77.21,
+         "system": "both", "verify_lagna": True}
+DASHA = {"start_iso": "1990-05-17T09:05:07.25+00:00", "levels": 3}
+
+@pytest.mark.parametrize("path, body, model, cached", [
+    ("/calc_birth_chart", CHART, main.BirthChartIn, main._birth_chart_cached),
+    ("/calc_dasha", DASHA, main.DashaIn, main._dasha_cached),
+])
+def test_cache_hit_matches_cold_call(path, body, model, cached):
+    cached.cache_clear()
+    cold = cached.__wrapped__(model(**body))
+    assert b"\"error\"" not in cold
+    first = client.post(path, json=body)
+    hits = cached.cache_info().hits
+    second = client.post(path, json=body)
+    assert cached.cache_info().hits == hits + 1
+    assert first.content == second.content == cold
+    assert first.headers["content-type"] == "application/json"